@@ -0,0 +1,115 @@
+"""Startup import-time benchmark.
+
+Runs a fresh interpreter with `-X importtime`, loads the config and resolves
+only the widgets and renderer it names (nothing is collected or rendered),
+then summarizes the import log.
+
+    uv run python benchmarks/bench_import.py --config config.yaml
+    uv run python benchmarks/bench_import.py --config config.yaml --budget-ms 150
+
+Exits non-zero if the cumulative import time exceeds --budget-ms, or if a
+heavy module is imported that the config does not need (e.g. Playwright on
+a Pillow run).
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+SNIPPET = """
+import sys
+from wallboard.cli import main
+from wallboard.config import load_config
+from wallboard.widgets import REGISTRY
+from wallboard.renderers import load_renderer
+cfg = load_config(sys.argv[1])
+for name in cfg.widget_order:
+    REGISTRY.get(name)
+load_renderer(sys.argv[2] or cfg.renderer_kind)
+"""
+
+# top-level module -> what in the config justifies importing it
+HEAVY = {
+    "playwright": "renderer web",
+    "PIL": "renderer pillow",
+    "caldav": "calendar.source caldav",
+    "icalendar": "widget calendar",
+    "dateutil": "widget calendar",
+    "requests": "widget weather",
+    "psutil": "widget system",
+}
+
+def _parse(stderr: str) -> dict[str, tuple[int, int]]:
+    """Return module -> (self_us, cumulative_us) from an -X importtime log."""
+    out: dict[str, tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cum_us, mod = line[len("import time:"):].split("|", 2)
+            # nested imports keep their leading indentation
+            out[mod[1:].rstrip()] = (int(self_us), int(cum_us))
+        except ValueError:
+            continue
+    return out
+
+def _needed(config: str, renderer: str) -> set[str]:
+    from wallboard.config import load_config
+
+    cfg = load_config(config)
+    kind = (renderer or cfg.renderer_kind).lower()
+    widgets = set(cfg.widget_order)
+    source = cfg.calendar["source"]
+    reasons = {f"renderer {kind}"} | {f"widget {w}" for w in widgets}
+    if "calendar" in widgets:
+        reasons.add(f"calendar.source {source}")
+    return {mod for mod, why in HEAVY.items() if why in reasons}
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--renderer", default="", help="Override renderer.kind from config")
+    ap.add_argument("--runs", type=int, default=5, help="Take the best of N runs")
+    ap.add_argument("--top", type=int, default=15, help="Show the N slowest top-level imports")
+    ap.add_argument("--budget-ms", type=float, default=0.0, help="Fail if total import time exceeds this")
+    args = ap.parse_args()
+
+    best: dict[str, tuple[int, int]] | None = None
+    best_total = 0
+    for _ in range(max(1, args.runs)):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SNIPPET, args.config, args.renderer],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            sys.stderr.write(proc.stderr)
+            return proc.returncode
+        mods = _parse(proc.stderr)
+        # only un-indented entries are top-level; their cumulative times sum to the total
+        total = sum(cum for mod, (_, cum) in mods.items() if not mod.startswith(" "))
+        if best is None or total < best_total:
+            best, best_total = mods, total
+    assert best is not None
+
+    top = sorted(
+        ((mod, cum) for mod, (_, cum) in best.items() if not mod.startswith(" ")),
+        key=lambda x: x[1], reverse=True,
+    )[: args.top]
+    print(f"total import time: {best_total / 1000:.1f} ms (best of {args.runs})")
+    for mod, cum in top:
+        print(f"  {cum / 1000:8.1f} ms  {mod}")
+
+    loaded = {mod.strip().split(".")[0] for mod in best}
+    unexpected = sorted((loaded & set(HEAVY)) - _needed(args.config, args.renderer))
+    status = 0
+    if unexpected:
+        print(f"FAIL: imported but not needed by config: {', '.join(unexpected)}")
+        status = 1
+    if args.budget_ms and best_total / 1000 > args.budget_ms:
+        print(f"FAIL: over budget ({args.budget_ms:.1f} ms)")
+        status = 1
+    return status
+
+if __name__ == "__main__":
+    raise SystemExit(main())
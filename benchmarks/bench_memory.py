@@ -0,0 +1,74 @@
+"""Peak memory of Pillow renders, per resolution and mode.
+
+Each measurement runs in a fresh interpreter so peaks don't leak between
+runs. Reports the peak RSS growth during the render (ru_maxrss, which sees
+Pillow's image buffers) and the tracemalloc peak (Python-level allocations
+only, e.g. bytes objects).
+
+    uv run python benchmarks/bench_memory.py
+    uv run python benchmarks/bench_memory.py --resolution 3840x2160 --mode low_memory
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+MODES = {
+    "default": {"tiles": 1},
+    "low_memory": {"low_memory": True},
+}
+
+CHILD = """
+import json, resource, sys, tempfile, time, tracemalloc
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+from bench_tiled import THEME, _dashboard
+from wallboard.renderers import render_pillow
+
+w, h = (int(v) for v in sys.argv[2].split("x"))
+cfg = json.loads(sys.argv[3])
+dash = _dashboard()
+with tempfile.TemporaryDirectory() as d:
+    out = Path(d) / "out.png"
+    # warm up fonts and caches on a tiny frame so they don't count
+    render_pillow.render(out, dash, (320, 200), 3, THEME, {"tiles": 1})
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    render_pillow.render(out, dash, (w, h), 3, THEME, cfg)
+    secs = time.perf_counter() - t0
+    _, traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"rss_kb": peak - base, "traced": traced, "secs": secs}))
+"""
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--resolution", action="append", help="WxH (repeatable; default 1920x1080, 2560x1600, 3840x2160)")
+    ap.add_argument("--mode", action="append", choices=list(MODES), help="Repeatable; default all")
+    args = ap.parse_args()
+
+    here = str(Path(__file__).resolve().parent)
+    resolutions = args.resolution or ["1920x1080", "2560x1600", "3840x2160"]
+    print(f"{'resolution':<12} {'mode':<12} {'peak RSS':>10} {'tracemalloc':>12} {'time':>8}")
+    for res in resolutions:
+        for mode in args.mode or list(MODES):
+            proc = subprocess.run(
+                [sys.executable, "-c", CHILD, here, res, json.dumps(MODES[mode])],
+                capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                sys.stderr.write(proc.stderr)
+                return proc.returncode
+            r = json.loads(proc.stdout)
+            print(
+                f"{res:<12} {mode:<12} {r['rss_kb'] / 1024:8.1f}MB {r['traced'] / 2**20:10.1f}MB {r['secs']:7.2f}s"
+            )
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+"""Tiled Pillow rendering benchmark.
+
+Renders a fixed synthetic dashboard offline at each resolution, first
+serially (tiles=1) and then split into 2, 4, ... bands up to the CPU count,
+and reports wall time and speedup. Every tiled frame is checked to be
+pixel-identical to the serial one.
+
+    uv run python benchmarks/bench_tiled.py
+    uv run python benchmarks/bench_tiled.py --resolution 7680x4320 --runs 5
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image, ImageChops
+
+from wallboard.dashboard import DashboardData
+from wallboard.renderers import render_pillow
+from wallboard.widgets.base import WidgetResult
+
+THEME = {"background": "#020402", "foreground": "#00ff66", "foreground_dim": "#00aa44"}
+
+def _dashboard() -> DashboardData:
+    return DashboardData(results=[
+        WidgetResult("clock", "Time", {"time": "12:34", "date": "Mon Oct 19, 2026"}),
+        WidgetResult("weather", "Weather", {
+            "location": "New York, NY", "temp": 61.2, "feels_like": 59.8, "wind": 7.4,
+            "hourly_time": [f"2026-10-19T{h:02d}:00" for h in range(12, 18)],
+            "hourly_temp": [61.2, 62.0, 62.5, 61.9, 60.3, 58.8],
+            "hourly_pop": [0, 5, 10, 20, 35, 40],
+        }),
+        WidgetResult("calendar", "Today", {"events": [
+            {"time": f"{h:02d}:00", "summary": f"Meeting number {h}"} for h in range(13, 18)
+        ]}),
+        WidgetResult("system", "System", {
+            "cpu_pct": 12.5, "mem_pct": 43.1, "mem_used_gb": 6.9, "mem_total_gb": 16.0,
+            "disks": [{"mount": "/", "pct": 51.0, "free_gb": 220.3}],
+        }),
+        WidgetResult("broken", "Broken", {}, ok=False, error="synthetic failure"),
+        WidgetResult("extra", "Extra", {"k": "v"}),
+    ])
+
+def _time(out: Path, dash: DashboardData, res: tuple[int, int], tiles: int, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        render_pillow.render(out, dash, res, 3, THEME, {"tiles": tiles})
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--resolution", action="append", help="WxH (repeatable; default 3840x2160 and 7680x4320)")
+    ap.add_argument("--runs", type=int, default=3, help="Take the best of N runs")
+    ap.add_argument("--max-tiles", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+
+    resolutions = [tuple(int(v) for v in r.split("x")) for r in (args.resolution or ["3840x2160", "7680x4320"])]
+    counts = [1]
+    while counts[-1] * 2 <= args.max_tiles:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != args.max_tiles:
+        counts.append(args.max_tiles)
+
+    dash = _dashboard()
+    status = 0
+    print(f"cpus: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as d:
+        for w, h in resolutions:
+            serial_path = Path(d) / "serial.png"
+            base = _time(serial_path, dash, (w, h), 1, args.runs)
+            with Image.open(serial_path) as im:
+                serial = im.copy()
+            print(f"{w}x{h}")
+            print(f"  tiles={1:<3d} {base:7.3f}s  x1.00")
+            for n in counts[1:]:
+                path = Path(d) / f"tiles{n}.png"
+                t = _time(path, dash, (w, h), n, args.runs)
+                with Image.open(path) as im:
+                    same = ImageChops.difference(serial, im).getbbox() is None
+                print(f"  tiles={n:<3d} {t:7.3f}s  x{base / t:.2f}{'' if same else '  MISMATCH'}")
+                if not same:
+                    status = 1
+    return status
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,205 @@
+"""Scale/stress harness for large dashboards.
+
+Drives the whole pipeline offline (collect_all -> _compute_layout ->
+render_pillow, the JSON payload, and optionally render_web) with synthetic
+widgets whose payload sizes you choose, across a grid of panel counts and
+resolutions. Each case runs in a fresh interpreter and reports latency
+percentiles per stage and the peak RSS of the process. A case that fails
+is reported with the stage and the error, and the sweep carries on.
+
+    uv run python benchmarks/stress.py
+    uv run python benchmarks/stress.py --panels 8,32,64 --columns 6 --events 200 --hours 168 --mounts 40
+    uv run python benchmarks/stress.py --resolution 3840x2160 --low-memory --web
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+THEME = {"background": "#020402", "foreground": "#00ff66", "foreground_dim": "#00aa44"}
+KINDS = ("clock", "weather", "calendar", "system", "custom")
+
+@dataclass(frozen=True)
+class SyntheticWidget:
+    """Stands in for a real widget: same result shape, no I/O."""
+    kind: str
+    events: int
+    hours: int
+    mounts: int
+
+    @property
+    def name(self) -> str:
+        return f"stress_{self.kind}"
+
+    @property
+    def title(self) -> str:
+        return f"Stress {self.kind}"
+
+    def collect(self, cfg: dict):
+        from wallboard.widgets.base import WidgetResult
+
+        if self.kind == "clock":
+            data = {"time": "12:34", "date": "Mon Oct 19, 2026"}
+        elif self.kind == "weather":
+            data = {
+                "location": "New York, NY", "temp": 61.2, "feels_like": 59.8, "wind": 7.4, "precip": 0.0,
+                "hourly_time": [f"2026-10-{19 + h // 24:02d}T{h % 24:02d}:00" for h in range(self.hours)],
+                "hourly_temp": [round(55 + (h % 24) * 0.5, 1) for h in range(self.hours)],
+                "hourly_pop": [(h * 7) % 100 for h in range(self.hours)],
+            }
+        elif self.kind == "calendar":
+            data = {"events": [
+                {"time": f"{(i // 4) % 24:02d}:{(i % 4) * 15:02d}", "summary": f"Synthetic event {i} with a longish title"}
+                for i in range(self.events)
+            ]}
+        elif self.kind == "system":
+            data = {
+                "cpu_pct": 12.5, "mem_pct": 43.1, "mem_used_gb": 6.9, "mem_total_gb": 16.0,
+                "disks": [
+                    {"mount": f"/mnt/disk{i}", "used_gb": 100.0 + i, "free_gb": 200.0 - i, "pct": (i * 3) % 100}
+                    for i in range(self.mounts)
+                ],
+            }
+        else:
+            data = {f"key{i}": i for i in range(self.events)}
+        # reuse the real kind's name so the renderers format it the same way
+        return WidgetResult(name=self.kind, title=self.title, data=data)
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    s = sorted(samples)
+    pick = lambda q: s[min(len(s) - 1, int(round(q * (len(s) - 1))))]
+    return {"p50": pick(0.50), "p95": pick(0.95), "max": s[-1]}
+
+def run_case(args: argparse.Namespace) -> dict:
+    """One (panels, resolution) case, in this process."""
+    import resource
+    import tempfile
+    import time
+
+    from wallboard.dashboard import collect_all
+    from wallboard.renderers import render_pillow
+    from wallboard.renderers.render_pillow import _compute_layout
+    from wallboard.widgets import REGISTRY
+
+    w, h = (int(v) for v in args.case_resolution.split("x"))
+    order = []
+    for i in range(args.case_panels):
+        widget = SyntheticWidget(KINDS[i % len(KINDS)], args.events, args.hours, args.mounts)
+        REGISTRY.register(widget.name, widget)
+        order.append(widget.name)
+    pillow_cfg = {"low_memory": True} if args.low_memory else {"tiles": args.tiles}
+
+    stages: dict[str, list[float]] = {"collect": [], "layout": [], "pillow": [], "payload": []}
+    if args.web:
+        stages["web"] = []
+    stage = "setup"
+    payload = b""
+
+    try:
+        if args.web:
+            from wallboard.renderers import render_web
+
+        with tempfile.TemporaryDirectory() as d:
+            out = Path(d) / "out.png"
+            for _ in range(args.runs):
+                stage = "collect"
+                t0 = time.perf_counter()
+                dash = collect_all({}, order)
+                stages["collect"].append(time.perf_counter() - t0)
+
+                stage = "layout"
+                t0 = time.perf_counter()
+                _compute_layout(w, h, args.columns, len(dash.results))
+                stages["layout"].append(time.perf_counter() - t0)
+
+                stage = "pillow"
+                t0 = time.perf_counter()
+                render_pillow.render(out, dash, (w, h), args.columns, THEME, pillow_cfg)
+                stages["pillow"].append(time.perf_counter() - t0)
+
+                stage = "payload"
+                t0 = time.perf_counter()
+                payload = json.dumps(dash.payload()).encode("utf-8")
+                stages["payload"].append(time.perf_counter() - t0)
+
+                if args.web:
+                    stage = "web"
+                    t0 = time.perf_counter()
+                    render_web.render(Path(d) / "web.png", dash, (w, h), args.columns, THEME, {})
+                    stages["web"].append(time.perf_counter() - t0)
+    except Exception as e:
+        return {
+            "failed": {"stage": stage, "error": f"{type(e).__name__}: {e}"},
+            "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+
+    return {
+        "stages": {k: _percentiles(v) for k, v in stages.items()},
+        "payload_bytes": len(payload),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--panels", default="4,12,24,48", help="Comma-separated panel counts")
+    ap.add_argument("--resolution", action="append", help="WxH (repeatable; default 1920x1080 and 3840x2160)")
+    ap.add_argument("--columns", type=int, default=4)
+    ap.add_argument("--events", type=int, default=50, help="Events per calendar panel (and keys per custom panel)")
+    ap.add_argument("--hours", type=int, default=48, help="Hourly forecast points per weather panel")
+    ap.add_argument("--mounts", type=int, default=16, help="Disks per system panel")
+    ap.add_argument("--runs", type=int, default=5, help="Repetitions per case")
+    ap.add_argument("--tiles", type=int, default=1, help="pillow_renderer.tiles")
+    ap.add_argument("--low-memory", action="store_true", help="pillow_renderer.low_memory")
+    ap.add_argument("--web", action="store_true", help="Also time render_web (needs a Playwright browser)")
+    ap.add_argument("--json", action="store_true", help="Print raw results as JSON lines")
+    # internal: run a single case and print its JSON
+    ap.add_argument("--case-panels", type=int, help=argparse.SUPPRESS)
+    ap.add_argument("--case-resolution", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.case_panels is not None:
+        print(json.dumps(run_case(args)))
+        return 0
+
+    passthrough = [
+        "--columns", str(args.columns), "--events", str(args.events), "--hours", str(args.hours),
+        "--mounts", str(args.mounts), "--runs", str(args.runs), "--tiles", str(args.tiles),
+    ] + (["--low-memory"] if args.low_memory else []) + (["--web"] if args.web else [])
+
+    if not args.json:
+        stages = "collect layout pillow payload" + (" web" if args.web else "")
+        print(f"columns={args.columns} events={args.events} hours={args.hours} mounts={args.mounts} runs={args.runs}")
+        print(f"{'panels':>6} {'resolution':<10} " + " ".join(f"{s + ' p50/p95 ms':>20}" for s in stages.split())
+              + f" {'JSON KB':>8} {'peak RSS MB':>12}")
+    failures = 0
+    for res in args.resolution or ["1920x1080", "3840x2160"]:
+        for panels in (int(p) for p in args.panels.split(",")):
+            proc = subprocess.run(
+                [sys.executable, __file__, "--case-panels", str(panels), "--case-resolution", res, *passthrough],
+                capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                # the case died outright (OOM kill, crash in C code): no JSON from it
+                last = (proc.stderr.strip().splitlines() or [f"exit status {proc.returncode}"])[-1]
+                r = {"failed": {"stage": "process", "error": last}}
+            else:
+                r = json.loads(proc.stdout)
+            failures += "failed" in r
+            if args.json:
+                print(json.dumps({"panels": panels, "resolution": res, **r}))
+                continue
+            if "failed" in r:
+                print(f"{panels:>6} {res:<10} FAILED in {r['failed']['stage']}: {r['failed']['error']}")
+                continue
+            cols = " ".join(
+                f"{st['p50'] * 1000:>10.1f}/{st['p95'] * 1000:<9.1f}" for st in r["stages"].values()
+            )
+            print(f"{panels:>6} {res:<10} {cols} {r['payload_bytes'] / 1024:>8.1f} {r['peak_rss_kb'] / 1024:>12.1f}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
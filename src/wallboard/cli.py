@@ -1,31 +1,89 @@
 from __future__ import annotations
 
 import argparse
-from .config import load_config
+import dataclasses
+import sys
+import time
+from .config import Config, ConfigError, load_config
 from .dashboard import collect_all
-from .wallpaper import set_gnome_wallpaper
-from .renderers import render_with
+from .wallpaper import make_backend, set_gnome_wallpaper
+from .renderers import render_outputs
+from .watch import ConfigWatcher
+
+def run_once(cfg: Config, args: argparse.Namespace) -> bool:
+    """Collect, render every output, and set the wallpaper. True if all outputs rendered."""
+    outputs = cfg.outputs
+    if args.renderer:
+        outputs = tuple(dataclasses.replace(o, renderer_kind=args.renderer) for o in outputs)
+
+    t0 = time.perf_counter()
+    dash = collect_all(cfg.raw, list(cfg.widget_order))
+    print(f"collect: {len(dash.results)} widgets in {time.perf_counter() - t0:.2f}s")
+
+    results = render_outputs(
+        list(outputs), dash, cfg.web_renderer.as_dict(), cfg.pillow_renderer.as_dict(), max_workers=args.workers,
+    )
+    for out, res in zip(outputs, results):
+        w, h = out.resolution
+        if res.ok:
+            print(f"output {res.name}: {w}x{h} {out.renderer_kind} -> {res.path} in {res.seconds:.2f}s")
+        else:
+            print(f"output {res.name}: {w}x{h} {out.renderer_kind} FAILED after {res.seconds:.2f}s: {res.error}", file=sys.stderr)
+
+    if not args.no_set:
+        # GNOME has a single background; the first output that asks for it wins
+        for out, res in zip(outputs, results):
+            if out.set_gnome_wallpaper and res.ok:
+                set_gnome_wallpaper(res.path, make_backend(cfg.wallpaper_backend))
+                break
+
+    return all(r.ok for r in results)
+
+def watch(cfg: Config, args: argparse.Namespace) -> None:
+    """Re-render every refresh_minutes, and immediately when the config file changes."""
+    watcher = ConfigWatcher(args.config, cfg)
+    while True:
+        try:
+            run_once(watcher.cfg, args)
+        except Exception as e:
+            # e.g. no GNOME session to set the wallpaper in; try again next period
+            print(f"run failed: {type(e).__name__}: {e}", file=sys.stderr)
+        deadline = time.monotonic() + watcher.cfg.refresh_minutes * 60
+        while time.monotonic() < deadline:
+            time.sleep(min(args.poll_seconds, max(0.0, deadline - time.monotonic())))
+            try:
+                changed = watcher.poll()
+            except Exception as e:
+                # e.g. a widget's invalidate_caches hook; the new config applies at the next run
+                print(f"config poll failed: {type(e).__name__}: {e}", file=sys.stderr)
+                continue
+            if changed:
+                print(f"config reloaded: {', '.join(sorted(changed))} changed")
+                break
 
 def main() -> None:
     ap = argparse.ArgumentParser(prog="wallboard")
     ap.add_argument("--config", default="config.yaml", help="Path to config.yaml")
-    ap.add_argument("--renderer", choices=["pillow", "web"], help="Override renderer.kind from config")
+    ap.add_argument("--renderer", help="Override renderer.kind from config (pillow, web, or a plugin renderer)")
     ap.add_argument("--no-set", action="store_true", help="Do not set GNOME wallpaper")
+    ap.add_argument("--workers", type=int, help="Max parallel render processes (default: one per output, up to CPU count)")
+    ap.add_argument("--watch", action="store_true", help="Keep running: re-render every refresh_minutes and hot-reload the config")
+    ap.add_argument("--poll-seconds", type=float, default=2.0, help="How often --watch/serve check the config file for changes")
+    sub = ap.add_subparsers(dest="command")
+    sp = sub.add_parser("serve", help="Render on the refresh schedule and serve images and data over HTTP")
+    sp.add_argument("--host", default="127.0.0.1", help="Address to listen on (0.0.0.0 for all interfaces)")
+    sp.add_argument("--port", type=int, default=8080)
     args = ap.parse_args()
 
-    cfg = load_config(args.config)
-    raw = cfg.raw
-
-    renderer = args.renderer or cfg.renderer_kind
-    order = cfg.widget_order
-
-    dash = collect_all(raw, order)
-    out_path = cfg.output_path
-
-    theme = raw.get("theme", {})
-    web_cfg = raw.get("web_renderer", {})
-
-    rendered = render_with(renderer, out_path, dash, cfg.resolution, cfg.columns, theme, web_cfg)
+    try:
+        cfg = load_config(args.config)
+    except ConfigError as e:
+        raise SystemExit(str(e))
 
-    if cfg.set_gnome_wallpaper and not args.no_set:
-        set_gnome_wallpaper(rendered)
+    if args.command == "serve":
+        from .serve import serve
+        serve(cfg, args.config, args.host, args.port, args.poll_seconds, args.renderer, args.workers)
+    elif args.watch:
+        watch(cfg, args)
+    elif not run_once(cfg, args):
+        raise SystemExit(1)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field, fields
 from pathlib import Path
+from types import MappingProxyType
 import os
+import re
 import yaml
 
 SUPPORTED_RESOLUTIONS = {
@@ -11,44 +14,358 @@ SUPPORTED_RESOLUTIONS = {
     "2560x1600": (2560, 1600),
 }
 
+_HEX_COLOR = re.compile(r"^#[0-9a-fA-F]{6}$")
+
+# Defaults for the widget sections. The compiled sections the widgets
+# receive always have every key; widgets fall back to these when called
+# with an uncompiled mapping.
+WEATHER_DEFAULTS: Mapping[str, object] = MappingProxyType({
+    "zip_code": "",
+    "units": "imperial",
+    "cache_expire_seconds": 3600,
+})
+CALENDAR_DEFAULTS: Mapping[str, object] = MappingProxyType({
+    "source": "ics",
+    "ics_path": "",
+    "caldav_url": "",
+    "caldav_username": "",
+    "caldav_password": "",
+    "horizon_hours": 12,
+    "max_events": 5,
+})
+
+class ConfigError(ValueError):
+    """The config file is invalid. `errors` lists every problem found."""
+
+    def __init__(self, errors: list[str]) -> None:
+        self.errors = errors
+        super().__init__("Invalid config:\n  " + "\n  ".join(errors))
+
 def _expand(path: str) -> str:
     return os.path.expanduser(os.path.expandvars(path))
 
+@dataclass(frozen=True)
+class Theme:
+    name: str = "matrix"
+    background: str = "#020402"
+    foreground: str = "#00ff66"
+    foreground_dim: str = "#00aa44"
+    warning: str = "#ffee55"
+    alert: str = "#ff3355"
+    panel_border: str = "#00aa44"
+    font_family: str = "DejaVuSansMono"
+    font_path: str | None = None
+    # Keys the built-in renderers don't use, passed through for plugin
+    # renderers. Pairs rather than a dict so the theme stays hashable.
+    extra: tuple[tuple[str, object], ...] = ()
+
+    def as_dict(self) -> dict:
+        # renderers (including plugins) take the theme as a plain dict
+        d = {f.name: getattr(self, f.name) for f in fields(self) if f.name != "extra"}
+        return {**dict(self.extra), **{k: v for k, v in d.items() if v is not None}}
+
+@dataclass(frozen=True)
+class WebRendererConfig:
+    viewport_device_scale_factor: float = 1.0
+    browser: str = "chromium"
+    headless: bool = True
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+@dataclass(frozen=True)
+class PillowRendererConfig:
+    tiles: int | str = "auto"
+    low_memory: bool = False
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+@dataclass(frozen=True)
+class OutputConfig:
+    """One rendered image: a display, or one of several displays."""
+    name: str
+    path: Path
+    resolution: tuple[int, int]
+    columns: int
+    renderer_kind: str
+    theme: Theme
+    set_gnome_wallpaper: bool = False
+
 @dataclass(frozen=True)
 class Config:
-    raw: dict
+    """A validated config, compiled once by load_config()/compile_config().
+
+    `raw` is the parsed YAML, kept for widgets, which receive it. Its
+    `weather` and `calendar` sections are replaced by the compiled ones:
+    read-only, validated, and with every default filled in.
+    """
+    raw: dict = field(repr=False, compare=False)
+    resolution: tuple[int, int]
+    columns: int
+    refresh_minutes: int
+    output_path: Path
+    set_gnome_wallpaper: bool
+    wallpaper_backend: str
+    renderer_kind: str
+    widget_order: tuple[str, ...]
+    theme: Theme
+    weather: Mapping[str, object]
+    calendar: Mapping[str, object]
+    web_renderer: WebRendererConfig
+    pillow_renderer: PillowRendererConfig
+    # Images to render from one collection pass. Without an `outputs:` list
+    # this is the single image described by the top-level keys.
+    outputs: tuple[OutputConfig, ...]
+
+class _Compiler:
+    """Collects every error instead of stopping at the first one."""
+
+    def __init__(self) -> None:
+        self.errors: list[str] = []
+
+    def section(self, raw: dict, key: str) -> dict:
+        val = raw.get(key, {})
+        if val is None:
+            return {}
+        if not isinstance(val, dict):
+            self.errors.append(f"{key}: must be a mapping")
+            return {}
+        return val
 
-    @property
-    def resolution(self) -> tuple[int, int]:
-        res = self.raw.get("resolution", "1920x1080")
-        if res not in SUPPORTED_RESOLUTIONS:
-            raise ValueError(f"Unsupported resolution {res!r}. Supported: {list(SUPPORTED_RESOLUTIONS)}")
-        return SUPPORTED_RESOLUTIONS[res]
+    def as_int(self, where: str, val, minimum: int | None = None) -> int:
+        try:
+            out = int(val)
+        except (TypeError, ValueError):
+            self.errors.append(f"{where}: expected an integer, got {val!r}")
+            return minimum or 0
+        if minimum is not None and out < minimum:
+            self.errors.append(f"{where}: must be at least {minimum}, got {out}")
+        return out
 
-    @property
-    def columns(self) -> int:
-        return int(self.raw.get("columns", 3))
+    def as_float(self, where: str, val) -> float:
+        try:
+            return float(val)
+        except (TypeError, ValueError):
+            self.errors.append(f"{where}: expected a number, got {val!r}")
+            return 0.0
 
-    @property
-    def output_path(self) -> Path:
-        out = self.raw.get("output", {}).get("path", "~/.cache/wallboard/wallpaper.png")
-        return Path(_expand(out))
+    def as_str(self, where: str, val) -> str:
+        # YAML reads `zip_code: 10001` as an int; that's fine, null is not
+        if isinstance(val, bool) or not isinstance(val, (str, int, float)):
+            self.errors.append(f"{where}: expected a string, got {val!r}")
+            return ""
+        return str(val)
 
-    @property
-    def set_gnome_wallpaper(self) -> bool:
-        return bool(self.raw.get("output", {}).get("set_gnome_wallpaper", False))
+    def as_bool(self, where: str, val) -> bool:
+        if not isinstance(val, bool):
+            self.errors.append(f"{where}: expected true or false, got {val!r}")
+        return bool(val)
 
-    @property
-    def renderer_kind(self) -> str:
-        return str(self.raw.get("renderer", {}).get("kind", "pillow"))
+    def choice(self, where: str, val, choices: tuple[str, ...]) -> str:
+        out = str(val).lower().strip()
+        if out not in choices:
+            self.errors.append(f"{where}: must be one of {list(choices)}, got {val!r}")
+        return out
 
-    @property
-    def widget_order(self) -> list[str]:
-        return list(self.raw.get("dashboard", {}).get("widgets", ["clock", "weather", "calendar", "system"]))
+    def resolution(self, where: str, val) -> tuple[int, int]:
+        if not isinstance(val, str) or val not in SUPPORTED_RESOLUTIONS:
+            self.errors.append(f"{where}: unsupported resolution {val!r}. Supported: {list(SUPPORTED_RESOLUTIONS)}")
+            return SUPPORTED_RESOLUTIONS["1920x1080"]
+        return SUPPORTED_RESOLUTIONS[val]
+
+    def renderer(self, where: str, val) -> str:
+        from .renderers import renderer_exists
+
+        kind = self.as_str(where, val).lower().strip()
+        if kind and not renderer_exists(kind):
+            self.errors.append(f"{where}: unknown renderer {kind!r} (not built in, and no plugin provides it)")
+        return kind
+
+    def widgets(self, where: str, val) -> list[str]:
+        from .widgets import REGISTRY
+
+        if not isinstance(val, list) or not all(isinstance(w, str) for w in val):
+            self.errors.append(f"{where}: must be a list of widget names")
+            return []
+        for i, name in enumerate(val):
+            # built-ins are checked by name, without importing them
+            if name not in REGISTRY:
+                self.errors.append(f"{where}[{i}]: unknown widget {name!r} (not built in, and no plugin provides it)")
+        return val
+
+    def theme(self, where: str, raw: dict, base: Theme) -> Theme:
+        known = {f.name for f in fields(Theme)} - {"extra"}
+        values = {}
+        extra = dict(base.extra)
+        for k, v in raw.items():
+            if k not in known:
+                if v is None or isinstance(v, (dict, list)):
+                    self.errors.append(f"{where}.{k}: expected a single value, got {v!r}")
+                else:
+                    extra[k] = v
+                continue
+            if k == "font_path":
+                values[k] = _expand(self.as_str(f"{where}.{k}", v)) if v else None
+                continue
+            v = self.as_str(f"{where}.{k}", v)
+            if k not in ("name", "font_family") and not _HEX_COLOR.match(v):
+                self.errors.append(f"{where}.{k}: expected a #rrggbb color, got {v!r}")
+                continue
+            values[k] = v
+        return Theme(**{**asdict(base), **values, "extra": tuple(extra.items())})
+
+    def compile(self, raw: dict) -> Config:
+        output = self.section(raw, "output")
+        renderer = self.section(raw, "renderer")
+        dashboard = self.section(raw, "dashboard")
+        wcfg = self.section(raw, "weather")
+        ccfg = self.section(raw, "calendar")
+        web = self.section(raw, "web_renderer")
+        pil = self.section(raw, "pillow_renderer")
+
+        resolution = self.resolution("resolution", raw.get("resolution", "1920x1080"))
+        columns = self.as_int("columns", raw.get("columns", 3), minimum=1)
+        output_path = Path(_expand(self.as_str("output.path", output.get("path", "~/.cache/wallboard/wallpaper.png"))))
+        set_wallpaper = self.as_bool("output.set_gnome_wallpaper", output.get("set_gnome_wallpaper", False))
+        wallpaper_backend = self.choice(
+            "output.wallpaper_backend", output.get("wallpaper_backend", "auto"), ("auto", "gio", "gsettings"),
+        )
+        renderer_kind = self.renderer("renderer.kind", renderer.get("kind", "pillow"))
+        theme = self.theme("theme", self.section(raw, "theme"), Theme())
+
+        widgets = self.widgets("dashboard.widgets", dashboard.get("widgets", ["clock", "weather", "calendar", "system"]))
+
+        wcfg = {**WEATHER_DEFAULTS, **wcfg}
+        weather = MappingProxyType({
+            **wcfg,
+            "zip_code": self.as_str("weather.zip_code", wcfg["zip_code"]).strip(),
+            "units": self.choice("weather.units", wcfg["units"], ("imperial", "metric")),
+            "cache_expire_seconds": self.as_int("weather.cache_expire_seconds", wcfg["cache_expire_seconds"], minimum=0),
+        })
+        ccfg = {**CALENDAR_DEFAULTS, **ccfg}
+        calendar = MappingProxyType({
+            **ccfg,
+            "source": self.choice("calendar.source", ccfg["source"], ("ics", "caldav")),
+            "ics_path": self.as_str("calendar.ics_path", ccfg["ics_path"]),
+            **{
+                key: self.as_str(f"calendar.{key}", ccfg[key]).strip()
+                for key in ("caldav_url", "caldav_username", "caldav_password")
+            },
+            "horizon_hours": self.as_int("calendar.horizon_hours", ccfg["horizon_hours"], minimum=0),
+            "max_events": self.as_int("calendar.max_events", ccfg["max_events"], minimum=0),
+        })
+        web_renderer = WebRendererConfig(
+            viewport_device_scale_factor=self.as_float(
+                "web_renderer.viewport_device_scale_factor", web.get("viewport_device_scale_factor", 1),
+            ),
+            browser=self.choice("web_renderer.browser", web.get("browser", "chromium"), ("chromium", "firefox", "webkit")),
+            headless=self.as_bool("web_renderer.headless", web.get("headless", True)),
+        )
+        tiles = pil.get("tiles", "auto")
+        if str(tiles).lower() != "auto":
+            tiles = self.as_int("pillow_renderer.tiles", tiles, minimum=1)
+        pillow_renderer = PillowRendererConfig(
+            tiles=tiles,
+            low_memory=self.as_bool("pillow_renderer.low_memory", pil.get("low_memory", False)),
+        )
+
+        outputs = self.outputs(raw, resolution, columns, renderer_kind, theme, output_path, set_wallpaper)
+        refresh_minutes = self.as_int("refresh_minutes", raw.get("refresh_minutes", 5), minimum=1)
+
+        if self.errors:
+            raise ConfigError(self.errors)
+        return Config(
+            raw={**raw, "weather": weather, "calendar": calendar},
+            resolution=resolution,
+            columns=columns,
+            refresh_minutes=refresh_minutes,
+            output_path=output_path,
+            set_gnome_wallpaper=set_wallpaper,
+            wallpaper_backend=wallpaper_backend,
+            renderer_kind=renderer_kind,
+            widget_order=tuple(widgets),
+            theme=theme,
+            weather=weather,
+            calendar=calendar,
+            web_renderer=web_renderer,
+            pillow_renderer=pillow_renderer,
+            outputs=outputs,
+        )
+
+    def outputs(
+        self,
+        raw: dict,
+        resolution: tuple[int, int],
+        columns: int,
+        renderer_kind: str,
+        theme: Theme,
+        output_path: Path,
+        set_wallpaper: bool,
+    ) -> tuple[OutputConfig, ...]:
+        # Each `outputs:` entry falls back to the top-level keys for anything
+        # it doesn't set, and its `theme` is merged over the top-level theme.
+        entries = raw.get("outputs")
+        if not entries:
+            return (OutputConfig("default", output_path, resolution, columns, renderer_kind, theme, set_wallpaper),)
+        if not isinstance(entries, list):
+            self.errors.append("outputs: must be a list of mappings")
+            return ()
+
+        outs: list[OutputConfig] = []
+        for i, entry in enumerate(entries):
+            where = f"outputs[{i}]"
+            if not isinstance(entry, dict):
+                self.errors.append(f"{where}: must be a mapping")
+                continue
+            name = self.as_str(f"{where}.name", entry.get("name", f"output{i}"))
+            path = self.as_str(f"{where}.path", entry.get("path", f"~/.cache/wallboard/wallpaper-{name}.png"))
+            out_theme = entry.get("theme", {})
+            if not isinstance(out_theme, dict):
+                self.errors.append(f"{where}.theme: must be a mapping")
+                out_theme = {}
+            outs.append(OutputConfig(
+                name=name,
+                path=Path(_expand(path)),
+                resolution=(
+                    self.resolution(f"{where}.resolution", entry["resolution"])
+                    if "resolution" in entry else resolution
+                ),
+                columns=self.as_int(f"{where}.columns", entry.get("columns", columns), minimum=1),
+                renderer_kind=(
+                    self.renderer(f"{where}.renderer", entry["renderer"])
+                    if "renderer" in entry else renderer_kind
+                ),
+                theme=self.theme(f"{where}.theme", out_theme, theme),
+                set_gnome_wallpaper=self.as_bool(f"{where}.set_gnome_wallpaper", entry.get("set_gnome_wallpaper", False)),
+            ))
+
+        paths = [o.path for o in outs]
+        if len(set(paths)) != len(paths):
+            self.errors.append("outputs: each output needs a distinct path")
+        names = [o.name for o in outs]
+        if len(set(names)) != len(names):
+            self.errors.append("outputs: each output needs a distinct name")
+        return tuple(outs)
+
+def compile_config(raw: dict) -> Config:
+    """Validate a parsed config mapping. Raises ConfigError listing every problem."""
+    if not isinstance(raw, dict):
+        raise ConfigError(["config.yaml must contain a YAML mapping at top level."])
+    return _Compiler().compile(raw)
 
 def load_config(path: str | Path) -> Config:
     p = Path(_expand(str(path)))
     raw = yaml.safe_load(p.read_text(encoding="utf-8"))
-    if not isinstance(raw, dict):
-        raise ValueError("config.yaml must contain a YAML mapping at top level.")
-    return Config(raw=raw)
+    return compile_config(raw)
+
+def changed_sections(old: Config, new: Config) -> set[str]:
+    """Names of the top-level Config fields that differ between two configs.
+
+    Per-output themes count as a "theme" change, since they feed the same
+    font and layer caches as the top-level theme.
+    """
+    changed = {f.name for f in fields(Config) if f.compare and getattr(old, f.name) != getattr(new, f.name)}
+    if {o.theme for o in old.outputs} != {o.theme for o in new.outputs}:
+        changed.add("theme")
+    return changed
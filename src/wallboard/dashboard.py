@@ -9,10 +9,31 @@ from .widgets.base import WidgetResult
 class DashboardData:
     results: list[WidgetResult]
 
+    def payload(self) -> dict:
+        """JSON-ready form, as embedded by the web renderer and served by `wallboard serve`."""
+        return {
+            "results": [
+                {
+                    "name": r.name,
+                    "title": r.title,
+                    "ok": r.ok,
+                    "error": r.error,
+                    "data": r.data,
+                }
+                for r in self.results
+            ]
+        }
+
 def collect_all(cfg_raw: dict, widget_order: list[str]) -> DashboardData:
     results: list[WidgetResult] = []
     for name in widget_order:
-        mod = REGISTRY.get(name)
+        try:
+            mod = REGISTRY.get(name)
+        except Exception as e:
+            # widget modules are imported lazily, so a missing optional
+            # dependency shows up here rather than at startup
+            results.append(WidgetResult(name=name, title=name, data={}, ok=False, error=str(e)))
+            continue
         if mod is None:
             results.append(WidgetResult(name=name, title=name, data={}, ok=False, error="Unknown widget"))
             continue
@@ -1,9 +1,87 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from importlib import import_module
 from pathlib import Path
+from types import ModuleType
+import os
+import time
+from ..config import OutputConfig
 from ..dashboard import DashboardData
 
-from . import render_pillow, render_web
+# Third-party renderers register in this entry point group, e.g.
+#
+#   [project.entry-points."wallboard.renderers"]
+#   eink = "mypackage.render_eink"
+#
+# The target must provide
+#   render(out_path, dash, resolution, columns, theme, web_cfg) -> Path
+ENTRY_POINT_GROUP = "wallboard.renderers"
+
+# Built-in renderers are imported on demand: a Pillow run never loads
+# Playwright and vice versa.
+_BUILTIN = {
+    "pillow": "render_pillow",
+    "web": "render_web",
+}
+
+_loaded: dict[str, ModuleType] = {}
+
+def load_renderer(kind: str) -> ModuleType:
+    kind = kind.lower().strip()
+    mod = _loaded.get(kind)
+    if mod is not None:
+        return mod
+    if kind in _BUILTIN:
+        mod = import_module(f".{_BUILTIN[kind]}", __name__)
+    else:
+        # importlib.metadata itself costs tens of ms; not needed for built-ins
+        from importlib.metadata import entry_points
+
+        for ep in entry_points(group=ENTRY_POINT_GROUP, name=kind):
+            mod = ep.load()
+            break
+        else:
+            raise ValueError(f"Unknown renderer: {kind}")
+    _loaded[kind] = mod
+    return mod
+
+def renderer_exists(kind: str) -> bool:
+    """True if load_renderer(kind) would find a renderer, without importing it."""
+    kind = kind.lower().strip()
+    if kind in _BUILTIN or kind in _loaded:
+        return True
+    from importlib.metadata import entry_points
+
+    return bool(entry_points(group=ENTRY_POINT_GROUP, name=kind))
+
+def invalidate_caches(changed: set[str]) -> None:
+    """Pass changed config section names to each loaded renderer that caches.
+
+    Renderers opt in by defining `invalidate_caches(changed)`.
+    """
+    for mod in _loaded.values():
+        hook = getattr(mod, "invalidate_caches", None)
+        if hook is not None:
+            hook(changed)
+
+def process_pool(max_workers: int):
+    """A ProcessPoolExecutor whose workers are not forked from this process.
+
+    `serve` renders while HTTP handler threads run, and a forked child
+    inherits any lock those threads held at that moment. forkserver workers
+    fork from a single-threaded server process instead; it preloads the
+    Pillow renderer, so they start warm.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload([f"{__name__}.render_pillow"])
+    else:
+        ctx = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx)
 
 def render_with(
     kind: str,
@@ -13,10 +91,77 @@ def render_with(
     columns: int,
     theme: dict,
     web_cfg: dict,
+    pillow_cfg: dict | None = None,
 ) -> Path:
     kind = kind.lower().strip()
+    mod = load_renderer(kind)
     if kind == "pillow":
-        return render_pillow.render(out_path, dash, resolution, columns, theme)
-    if kind == "web":
-        return render_web.render(out_path, dash, resolution, columns, theme, web_cfg)
-    raise ValueError(f"Unknown renderer: {kind}")
+        return mod.render(out_path, dash, resolution, columns, theme, pillow_cfg)
+    return mod.render(out_path, dash, resolution, columns, theme, web_cfg)
+
+@dataclass(frozen=True)
+class OutputResult:
+    name: str
+    path: Path
+    seconds: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+def render_atomic(
+    kind: str,
+    out_path: Path,
+    dash: DashboardData,
+    resolution: tuple[int, int],
+    columns: int,
+    theme: dict,
+    web_cfg: dict,
+    pillow_cfg: dict | None = None,
+) -> Path:
+    """Like render_with, but readers of out_path never see a partial image.
+
+    Renders to a hidden sibling (same directory, so same filesystem) and
+    renames it into place.
+    """
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    # keep the suffix: renderers pick the image format from it
+    tmp_path = out_path.with_name(f".{out_path.stem}.tmp{out_path.suffix}")
+    try:
+        rendered = render_with(kind, tmp_path, dash, resolution, columns, theme, web_cfg, pillow_cfg)
+        os.replace(rendered, out_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return out_path
+
+def _render_output(out: OutputConfig, dash: DashboardData, web_cfg: dict, pillow_cfg: dict | None) -> OutputResult:
+    t0 = time.perf_counter()
+    try:
+        path = render_atomic(
+            out.renderer_kind, out.path, dash, out.resolution, out.columns, out.theme.as_dict(), web_cfg, pillow_cfg,
+        )
+    except Exception as e:
+        return OutputResult(out.name, out.path, time.perf_counter() - t0, error=f"{type(e).__name__}: {e}")
+    return OutputResult(out.name, path, time.perf_counter() - t0)
+
+def render_outputs(
+    outputs: list[OutputConfig],
+    dash: DashboardData,
+    web_cfg: dict,
+    pillow_cfg: dict | None = None,
+    max_workers: int | None = None,
+) -> list[OutputResult]:
+    """Render every output from the same DashboardData, in parallel processes.
+
+    Results come back in the same order as `outputs`. A failing output is
+    reported in its OutputResult and does not stop the others.
+    """
+    if len(outputs) == 1 or max_workers == 1:
+        return [_render_output(out, dash, web_cfg, pillow_cfg) for out in outputs]
+    workers = min(len(outputs), max_workers or os.cpu_count() or 1)
+    # split the cores between outputs rather than letting each tile across all of them
+    pillow_cfg = {**(pillow_cfg or {}), "max_tiles": max(1, (os.cpu_count() or 1) // workers)}
+    with process_pool(workers) as pool:
+        futures = [pool.submit(_render_output, out, dash, web_cfg, pillow_cfg) for out in outputs]
+        return [f.result() for f in futures]
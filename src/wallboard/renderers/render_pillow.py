@@ -1,30 +1,54 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageChops, ImageDraw, ImageFont, ImageFilter
+from typing import BinaryIO
 import os
 import math
+import struct
+import zlib
 
 from ..dashboard import DashboardData
+from ..widgets.base import WidgetResult
+from . import text_layout
 
 def _hex(c: str) -> tuple[int, int, int]:
     c = c.lstrip("#")
     return tuple(int(c[i:i+2], 16) for i in (0, 2, 4))
 
-def _load_font(theme: dict, size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
-    # Allow explicit font_path, else try family name
-    font_path = theme.get("font_path")
+@lru_cache(maxsize=32)
+def _truetype(font: str, size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
     try:
-        if font_path:
-            fp = os.path.expanduser(font_path)
-            return ImageFont.truetype(fp, size=size)
-        # This usually works on Ubuntu for DejaVuSansMono
-        family = theme.get("font_family", "DejaVuSansMono")
-        return ImageFont.truetype(f"{family}.ttf", size=size)
+        return ImageFont.truetype(font, size=size)
     except Exception:
         return ImageFont.load_default()
 
+def _font_file(theme: dict) -> str:
+    # Allow explicit font_path, else try family name
+    font_path = theme.get("font_path")
+    if font_path:
+        return os.path.expanduser(font_path)
+    # This usually works on Ubuntu for DejaVuSansMono
+    family = theme.get("font_family", "DejaVuSansMono")
+    return f"{family}.ttf"
+
+def _load_font(theme: dict, size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    return _truetype(_font_file(theme), size)
+
+@lru_cache(maxsize=64)
+def _glyph_metrics(font: str, size: int) -> text_layout.GlyphMetrics:
+    # Keyed by what was asked for, not by the font object: the bitmap
+    # fallback has no path, and font objects' ids get reused
+    return text_layout.GlyphMetrics(_truetype(font, size))
+
+def invalidate_caches(changed: set[str]) -> None:
+    if "theme" in changed:
+        _truetype.cache_clear()
+        _glyph_metrics.cache_clear()
+        _fit_body.cache_clear()
+
 @dataclass(frozen=True)
 class Layout:
     width: int
@@ -45,13 +69,27 @@ def _compute_layout(width: int, height: int, columns: int, n: int) -> Layout:
     cell_h = (height - 2 * margin - (rows - 1) * gap) // rows
     return Layout(width, height, cols, gap, margin, cell_w, cell_h, rows)
 
-def _scanlines(img: Image.Image, strength: int = 18) -> Image.Image:
+@lru_cache(maxsize=4)
+def _scanline_lut(strength: int) -> tuple[int, ...]:
+    # What alpha_composite does to an opaque pixel under (0, 0, 0, strength),
+    # taken from Pillow itself so the in-place version matches it exactly
+    ramp = Image.frombytes("RGBA", (256, 1), bytes(v for i in range(256) for v in (i, i, i, 255)))
+    shade = Image.new("RGBA", (256, 1), (0, 0, 0, strength))
+    lut = Image.alpha_composite(ramp, shade).getchannel("R").tobytes()
+    return tuple(lut) * 3
+
+def _scanlines(img: Image.Image, strength: int = 18, top: int = 0) -> None:
+    """Darken every 4th pair of rows of an RGB image, in place.
+
+    `top` is the frame row img starts at, so bands keep the global 4px phase.
+    Only one 2-row strip is copied at a time; no full-size overlay.
+    """
     w, h = img.size
-    overlay = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-    d = ImageDraw.Draw(overlay)
-    for y in range(0, h, 4):
-        d.rectangle([0, y, w, y+1], fill=(0, 0, 0, strength))
-    return Image.alpha_composite(img.convert("RGBA"), overlay)
+    lut = _scanline_lut(strength)
+    for y in range(-(top % 4), h, 4):
+        box = (0, max(0, y), w, min(h, y + 2))
+        if box[1] < box[3]:
+            img.paste(img.crop(box).point(lut), box)
 
 def _draw_glow_text(img: Image.Image, draw: ImageDraw.ImageDraw, xy: tuple[int, int], text: str, font, fill_rgb, glow_rgb, glow_radius: int = 8):
     # Render glow on a temp layer and blur it
@@ -59,6 +97,9 @@ def _draw_glow_text(img: Image.Image, draw: ImageDraw.ImageDraw, xy: tuple[int,
     # Create small temp image around text
     tw, th = draw.textbbox((0, 0), text, font=font)[2:]
     pad = glow_radius * 2
+    if y - pad >= img.height or y + th + pad <= 0:
+        # entirely outside this band; skip the blur, nothing would land
+        return
     tmp = Image.new("RGBA", (tw + pad*2, th + pad*2), (0, 0, 0, 0))
     td = ImageDraw.Draw(tmp)
     td.text((pad, pad), text, font=font, fill=(*glow_rgb, 120))
@@ -67,13 +108,101 @@ def _draw_glow_text(img: Image.Image, draw: ImageDraw.ImageDraw, xy: tuple[int,
     img.paste(tmp, (x - pad, y - pad), tmp)
     draw.text((x, y), text, font=font, fill=fill_rgb)
 
-def render(
-    out_path: Path,
+def _panel_lines(res: WidgetResult) -> tuple[list[str], bool]:
+    """Body text for a panel, and whether to wrap it (else each line is ellipsized)."""
+    lines: list[str] = []
+    if not res.ok:
+        lines.append("ERROR")
+        if res.error:
+            lines.append(res.error)
+        return lines, True
+    # very baseline formatting; refine later per-widget
+    if res.name == "clock":
+        lines.append(res.data.get("time", ""))
+        lines.append(res.data.get("date", ""))
+    elif res.name == "weather":
+        loc = res.data.get("location", "")
+        temp = res.data.get("temp")
+        feels = res.data.get("feels_like")
+        wind = res.data.get("wind")
+        lines.append(loc)
+        if temp is not None:
+            lines.append(f"Temp: {temp}  Feels: {feels}")
+        if wind is not None:
+            lines.append(f"Wind: {wind}")
+        # mini hourly strip
+        ht = res.data.get("hourly_time", [])
+        htemp = res.data.get("hourly_temp", [])
+        hpop = res.data.get("hourly_pop", [])
+        if ht and htemp:
+            lines.append("Next hours:")
+            for t, tt, pop in zip(ht, htemp, hpop):
+                # t is ISO string from API, keep just HH:MM
+                hhmm = str(t)[11:16]
+                lines.append(f"{hhmm}  {tt}  POP {pop}%")
+    elif res.name == "calendar":
+        ev = res.data.get("events", [])
+        if not ev:
+            lines.append("No upcoming events")
+        else:
+            for e in ev:
+                lines.append(f'{e["time"]}  {e["summary"]}')
+    elif res.name == "system":
+        lines.append(f'CPU: {res.data.get("cpu_pct")}%')
+        lines.append(f'Mem: {res.data.get("mem_pct")}% ({res.data.get("mem_used_gb")} / {res.data.get("mem_total_gb")} GB)')
+        for dsk in res.data.get("disks", []):
+            lines.append(f'Disk {dsk["mount"]}: {dsk["pct"]}% (free {dsk["free_gb"]} GB)')
+    else:
+        return [str(res.data)], True
+    return lines, False
+
+@lru_cache(maxsize=256)
+def _fit_body(
+    font: str,
+    lines: tuple[str, ...],
+    max_width: int,
+    max_height: int,
+    max_size: int,
+    min_size: int,
+    wrap_lines: bool,
+) -> text_layout.TextBlock:
+    # Cached: every band of a tiled/low-memory render lays out the same panels
+    return text_layout.fit(
+        list(lines), lambda size: _glyph_metrics(font, size), max_width, max_height, max_size, min_size, wrap_lines,
+    )
+
+# Frames at least this large are split into bands when tiles is "auto"
+TILE_AUTO_MIN_PIXELS = 3840 * 2160
+
+def _band_count(resolution: tuple[int, int], pillow_cfg: dict) -> int:
+    tiles = pillow_cfg.get("tiles", "auto")
+    if str(tiles).lower() == "auto":
+        w, h = resolution
+        bands = 1 if w * h < TILE_AUTO_MIN_PIXELS else os.cpu_count() or 1
+    else:
+        bands = max(1, int(tiles))
+    # set by render_outputs when several outputs already share the cores
+    cap = pillow_cfg.get("max_tiles")
+    return max(1, min(bands, int(cap))) if cap else bands
+
+def _band_bounds(height: int, bands: int) -> list[tuple[int, int]]:
+    # Band edges fall on multiples of 4 (the scanline pitch)
+    step = max(4, -(-height // bands // 4) * 4)
+    return [(top, min(height, top + step)) for top in range(0, height, step)]
+
+def _render_band(
     dash: DashboardData,
     resolution: tuple[int, int],
     columns: int,
     theme: dict,
-) -> Path:
+    top: int,
+    bottom: int,
+) -> Image.Image:
+    """Rasterize frame rows [top, bottom) as an RGB image.
+
+    Everything is drawn in frame coordinates shifted up by `top`, so stacking
+    the bands of any split gives exactly the same pixels as one full band.
+    """
     w, h = resolution
     bg = _hex(theme.get("background", "#020402"))
     fg = _hex(theme.get("foreground", "#00ff66"))
@@ -81,21 +210,28 @@ def render(
     border = _hex(theme.get("panel_border", "#00aa44"))
     alert = _hex(theme.get("alert", "#ff3355"))
 
-    img = Image.new("RGBA", (w, h), (*bg, 255))
+    # Drawn straight onto RGB: the canvas is opaque, so an alpha channel would
+    # only add a quarter more memory and a conversion at the end
+    img = Image.new("RGB", (w, bottom - top), bg)
     draw = ImageDraw.Draw(img)
 
     n = max(1, len(dash.results))
     layout = _compute_layout(w, h, columns, n)
 
-    font_h = _load_font(theme, size=max(20, w // 90))
+    font = _font_file(theme)
+    m_h = _glyph_metrics(font, max(20, w // 90))
+    font_h = m_h.font
     font_b = _load_font(theme, size=max(16, w // 120))
     font_s = _load_font(theme, size=max(14, w // 140))
+    # body text shrinks from the normal size toward body_min to fit its panel
+    body_max = getattr(font_b, "size", 16)
+    body_min = max(10, w // 240)
 
     for i, res in enumerate(dash.results):
         r = i // layout.columns
         c = i % layout.columns
         x0 = layout.margin + c * (layout.cell_w + layout.gap)
-        y0 = layout.margin + r * (layout.cell_h + layout.gap)
+        y0 = layout.margin + r * (layout.cell_h + layout.gap) - top
         x1 = x0 + layout.cell_w
         y1 = y0 + layout.cell_h
 
@@ -103,62 +239,106 @@ def render(
         draw.rounded_rectangle([x0, y0, x1, y1], radius=18, outline=border, width=2)
 
         # Header
-        header = res.title
+        header = text_layout.ellipsize(m_h, res.title, layout.cell_w - 32)
         header_color = fg if res.ok else alert
         _draw_glow_text(img, draw, (x0 + 16, y0 + 12), header, font_h, header_color, fg, glow_radius=6)
 
-        # Body lines
-        lines: list[str] = []
-        if not res.ok:
-            lines.append("ERROR")
-            if res.error:
-                lines.append(res.error[:80])
-        else:
-            # very baseline formatting; refine later per-widget
-            if res.name == "clock":
-                lines.append(res.data.get("time", ""))
-                lines.append(res.data.get("date", ""))
-            elif res.name == "weather":
-                loc = res.data.get("location", "")
-                temp = res.data.get("temp")
-                feels = res.data.get("feels_like")
-                wind = res.data.get("wind")
-                lines.append(loc)
-                if temp is not None:
-                    lines.append(f"Temp: {temp}  Feels: {feels}")
-                if wind is not None:
-                    lines.append(f"Wind: {wind}")
-                # mini hourly strip
-                ht = res.data.get("hourly_time", [])
-                htemp = res.data.get("hourly_temp", [])
-                hpop = res.data.get("hourly_pop", [])
-                if ht and htemp:
-                    lines.append("Next hours:")
-                    for t, tt, pop in zip(ht, htemp, hpop):
-                        # t is ISO string from API, keep just HH:MM
-                        hhmm = str(t)[11:16]
-                        lines.append(f"{hhmm}  {tt}  POP {pop}%")
-            elif res.name == "calendar":
-                ev = res.data.get("events", [])
-                if not ev:
-                    lines.append("No upcoming events")
-                else:
-                    for e in ev:
-                        lines.append(f'{e["time"]}  {e["summary"][:40]}')
-            elif res.name == "system":
-                lines.append(f'CPU: {res.data.get("cpu_pct")}%')
-                lines.append(f'Mem: {res.data.get("mem_pct")}% ({res.data.get("mem_used_gb")} / {res.data.get("mem_total_gb")} GB)')
-                for dsk in res.data.get("disks", []):
-                    lines.append(f'Disk {dsk["mount"]}: {dsk["pct"]}% (free {dsk["free_gb"]} GB)')
-            else:
-                lines.append(str(res.data)[:120])
-
-        y = y0 + 58
-        for ln in lines[:18]:
-            draw.text((x0 + 16, y), ln, font=font_b, fill=fg_dim)
-            y += 22
-
-    img = _scanlines(img, strength=18)
+        # Body: fitted to the space under the header using real font metrics
+        body_top = y0 + 12 + m_h.line_height + 8
+        lines, wrap_lines = _panel_lines(res)
+        block = _fit_body(
+            font, tuple(lines), layout.cell_w - 32, y1 - 12 - body_top, body_max, body_min, wrap_lines,
+        )
+        y = body_top
+        for ln in block.lines:
+            # skip lines that can't touch this band (generous margin for ascenders)
+            if -2 * block.line_height < y < img.height + block.line_height:
+                draw.text((x0 + 16, y), ln, font=block.font, fill=fg_dim)
+            y += block.line_height
+
+    _scanlines(img, strength=18, top=top)
+    return img
+
+def _render_band_bytes(*args) -> bytes:
+    # process-pool entry point; raw bytes pickle much cheaper than an Image
+    return _render_band(*args).tobytes()
+
+# Band height for low_memory mode; a multiple of the 4px scanline pitch
+LOW_MEMORY_BAND_ROWS = 128
+
+def _png_chunk(fh: BinaryIO, kind: bytes, data: bytes) -> None:
+    fh.write(struct.pack(">I", len(data)) + kind + data)
+    fh.write(struct.pack(">I", zlib.crc32(kind + data)))
+
+def _write_png_streaming(fh: BinaryIO, size: tuple[int, int], bands) -> None:
+    """Encode RGB bands (top to bottom) as one PNG without holding the frame.
+
+    Every row uses PNG's "Sub" filter (each byte minus the one a pixel to its
+    left), which turns the flat panels and background into runs of zeros.
+    """
+    w, h = size
+    fh.write(b"\x89PNG\r\n\x1a\n")
+    _png_chunk(fh, b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0))
+    comp = zlib.compressobj(6)
+    stride = w * 3
+    for band in bands:
+        shifted = Image.new("RGB", band.size)
+        shifted.paste(band, (1, 0))
+        raw = ImageChops.subtract_modulo(band, shifted).tobytes()
+        del shifted
+        rows = b"".join(b"\x01" + raw[i:i + stride] for i in range(0, len(raw), stride))
+        data = comp.compress(rows)
+        if data:
+            _png_chunk(fh, b"IDAT", data)
+    _png_chunk(fh, b"IDAT", comp.flush())
+    _png_chunk(fh, b"IEND", b"")
+
+def _render_low_memory(
+    out_path: Path,
+    dash: DashboardData,
+    resolution: tuple[int, int],
+    columns: int,
+    theme: dict,
+) -> None:
+    w, h = resolution
+    bands = (
+        _render_band(dash, resolution, columns, theme, top, min(h, top + LOW_MEMORY_BAND_ROWS))
+        for top in range(0, h, LOW_MEMORY_BAND_ROWS)
+    )
+    with out_path.open("wb") as fh:
+        _write_png_streaming(fh, resolution, bands)
+
+def render(
+    out_path: Path,
+    dash: DashboardData,
+    resolution: tuple[int, int],
+    columns: int,
+    theme: dict,
+    pillow_cfg: dict | None = None,
+) -> Path:
+    w, h = resolution
+    pillow_cfg = pillow_cfg or {}
+    if pillow_cfg.get("low_memory"):
+        # peak memory is one band, not one frame; always serial
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        _render_low_memory(out_path, dash, resolution, columns, theme)
+        return out_path
+
+    bands = _band_bounds(h, _band_count(resolution, pillow_cfg))
+    if len(bands) == 1:
+        img = _render_band(dash, resolution, columns, theme, 0, h)
+    else:
+        from . import process_pool
+
+        img = Image.new("RGB", (w, h))
+        with process_pool(min(len(bands), os.cpu_count() or 1)) as pool:
+            futures = [
+                pool.submit(_render_band_bytes, dash, resolution, columns, theme, top, bottom)
+                for top, bottom in bands
+            ]
+            for (top, bottom), fut in zip(bands, futures):
+                img.paste(Image.frombytes("RGB", (w, bottom - top), fut.result()), (0, top))
+
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    img.convert("RGB").save(out_path, format="PNG")
+    img.save(out_path, format="PNG")
     return out_path
@@ -171,19 +171,6 @@ def render(
     gap = max(18, w // 120)
     radius = 22
 
-    payload = {
-        "results": [
-            {
-                "name": r.name,
-                "title": r.title,
-                "ok": r.ok,
-                "error": r.error,
-                "data": r.data,
-            }
-            for r in dash.results
-        ]
-    }
-
     html = HTML_TEMPLATE.format(
         w=w, h=h,
         cols=max(1, columns),
@@ -193,7 +180,7 @@ def render(
         fg_dim=theme.get("foreground_dim", "#00aa44"),
         border=theme.get("panel_border", "#00aa44"),
         alert=theme.get("alert", "#ff3355"),
-        data_json=json.dumps(payload),
+        data_json=json.dumps(dash.payload()),
     )
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from PIL import ImageFont
+
+ELLIPSIS = "…"
+
+Font = ImageFont.FreeTypeFont | ImageFont.ImageFont
+
+class GlyphMetrics:
+    """Advance widths for one font at one size, measured once per character.
+
+    Widths are summed per-glyph advances, so kerning is ignored; for the
+    monospace fonts the themes use that is exact, and close enough otherwise.
+    """
+
+    def __init__(self, font: Font) -> None:
+        self.font = font
+        self._advance: dict[str, float] = {}
+        if hasattr(font, "getmetrics"):
+            ascent, descent = font.getmetrics()
+        else:
+            # bitmap fallback font
+            ascent, descent = font.getbbox("Ag")[3], 0
+        self.ascent = ascent
+        self.line_height = ascent + descent + max(2, getattr(font, "size", 12) // 6)
+
+    def width(self, text: str) -> float:
+        adv = self._advance
+        total = 0.0
+        for ch in text:
+            w = adv.get(ch)
+            if w is None:
+                w = adv[ch] = self.font.getlength(ch)
+            total += w
+        return total
+
+def ellipsize(m: GlyphMetrics, text: str, max_width: float) -> str:
+    """text, or the longest prefix of it that fits with an ellipsis appended.
+
+    Line breaks become spaces: the result is always a single line.
+    """
+    text = " ".join(text.splitlines())
+    if m.width(text) <= max_width:
+        return text
+    budget = max_width - m.width(ELLIPSIS)
+    used = 0.0
+    for i, ch in enumerate(text):
+        used += m.width(ch)
+        if used > budget:
+            return text[:i].rstrip() + ELLIPSIS
+    return text + ELLIPSIS
+
+def wrap(m: GlyphMetrics, text: str, max_width: float) -> list[str]:
+    """Greedy word wrap, keeping any line breaks in text.
+
+    Words wider than a whole line are split by character.
+    """
+    if "\n" in text or "\r" in text:
+        return [part for ln in text.splitlines() or [""] for part in wrap(m, ln, max_width)]
+    lines: list[str] = []
+    cur = ""
+    for word in text.split(" "):
+        cand = f"{cur} {word}" if cur else word
+        if m.width(cand) <= max_width:
+            cur = cand
+            continue
+        if cur:
+            lines.append(cur)
+        cur = ""
+        while m.width(word) > max_width:
+            used, cut = 0.0, 0
+            for cut, ch in enumerate(word):
+                used += m.width(ch)
+                if used > max_width:
+                    break
+            cut = max(1, cut)
+            lines.append(word[:cut])
+            word = word[cut:]
+        cur = word
+    if cur or not lines:
+        lines.append(cur)
+    return lines
+
+@dataclass(frozen=True)
+class TextBlock:
+    """Lines laid out to fit a box, top to bottom, line_height apart."""
+    font: Font
+    line_height: int
+    lines: tuple[str, ...]
+
+def _layout(m: GlyphMetrics, lines: list[str], max_width: float, wrap_lines: bool) -> list[str]:
+    if wrap_lines:
+        return [part for ln in lines for part in wrap(m, ln, max_width)]
+    return [ellipsize(m, ln, max_width) for ln in lines]
+
+def fit(
+    lines: list[str],
+    load_metrics: Callable[[int], GlyphMetrics],
+    max_width: float,
+    max_height: float,
+    max_size: int,
+    min_size: int,
+    wrap_lines: bool = False,
+) -> TextBlock:
+    """Lay out lines at the largest font size in [min_size, max_size] that fits.
+
+    load_metrics(size) should be memoized by the caller: the search measures
+    the same sizes again for every panel. Each line is wrapped (wrap_lines)
+    or ellipsized to max_width. If nothing fits even at min_size, the block
+    is cut to as many lines as fit and the last one ends with an ellipsis.
+    """
+    def attempt(size: int) -> tuple[GlyphMetrics, list[str]]:
+        m = load_metrics(size)
+        return m, _layout(m, lines, max_width, wrap_lines)
+
+    def fits(m: GlyphMetrics, laid: list[str]) -> bool:
+        return len(laid) * m.line_height <= max_height
+
+    # binary search for the largest size that fits
+    lo, hi = min_size, max(min_size, max_size)
+    best: tuple[GlyphMetrics, list[str]] | None = None
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        m, laid = attempt(mid)
+        if fits(m, laid):
+            best = (m, laid)
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    if best is not None:
+        m, laid = best
+        return TextBlock(m.font, m.line_height, tuple(laid))
+
+    m, laid = attempt(min_size)
+    keep = max(0, int(max_height // m.line_height))
+    laid = laid[:keep]
+    if laid:
+        laid[-1] = ellipsize(m, laid[-1].rstrip(ELLIPSIS) + ELLIPSIS, max_width)
+    return TextBlock(m.font, m.line_height, tuple(laid))
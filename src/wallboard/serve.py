@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+import hashlib
+import json
+import re
+import sys
+import tempfile
+import threading
+import time
+
+from .config import Config, OutputConfig
+from .dashboard import DashboardData, collect_all
+from .renderers import render_outputs, render_with
+from .watch import ConfigWatcher
+
+# On-demand variants: size limits, how many to keep per data refresh, and
+# how many may render at once (each one is a full-frame render)
+VARIANT_MIN_PX = 160
+VARIANT_MAX_PX = 7680
+VARIANT_MAX_PIXELS = 3840 * 2160
+MAX_VARIANTS = 16
+MAX_CONCURRENT_VARIANTS = 2
+
+_VARIANT_PATH = re.compile(r"^/render/(\d+)x(\d+)\.png$")
+_OUTPUT_PATH = re.compile(r"^/outputs/([^/]+)\.png$")
+
+@dataclass(frozen=True)
+class Asset:
+    body: bytes
+    etag: str
+    content_type: str
+
+def _asset(body: bytes, content_type: str) -> Asset:
+    return Asset(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"', content_type)
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Everything served for one collection pass. Replaced whole, never mutated."""
+    generation: int
+    dash: DashboardData
+    data: Asset
+    images: dict[str, Asset]
+    # time.time() of the next scheduled refresh; drives Cache-Control
+    expires: float
+
+class Wallboard:
+    """Collects and renders on the refresh schedule; serves from memory.
+
+    Request handlers only read the current Snapshot, so any number of
+    clients share one collection pass and one render per output. Variants
+    at other resolutions are rendered on first request, once per refresh,
+    however many clients ask for them at the same time.
+    """
+
+    def __init__(
+        self,
+        cfg: Config,
+        config_path: str | Path,
+        poll_seconds: float = 2.0,
+        renderer: str | None = None,
+        workers: int | None = None,
+    ) -> None:
+        self.watcher = ConfigWatcher(config_path, cfg)
+        self.poll_seconds = poll_seconds
+        self.renderer = renderer
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._render_slots = threading.Semaphore(MAX_CONCURRENT_VARIANTS)
+        self._snapshot: Snapshot | None = None
+        self._variants: dict[tuple, Asset] = {}
+        self._pending: dict[tuple, Future] = {}
+
+    @property
+    def snapshot(self) -> Snapshot:
+        snap = self._snapshot
+        assert snap is not None, "refresh() has not run yet"
+        return snap
+
+    @property
+    def outputs(self) -> tuple[OutputConfig, ...]:
+        """The configured outputs, with --renderer applied."""
+        outputs = self.watcher.cfg.outputs
+        if self.renderer:
+            outputs = tuple(replace(o, renderer_kind=self.renderer) for o in outputs)
+        return outputs
+
+    def refresh(self) -> Snapshot:
+        cfg = self.watcher.cfg
+        outputs = self.outputs
+        t0 = time.perf_counter()
+        dash = collect_all(cfg.raw, list(cfg.widget_order))
+        results = render_outputs(
+            list(outputs), dash, cfg.web_renderer.as_dict(), cfg.pillow_renderer.as_dict(), max_workers=self.workers,
+        )
+        images = {}
+        for res in results:
+            if res.ok:
+                images[res.name] = _asset(res.path.read_bytes(), "image/png")
+            else:
+                print(f"output {res.name} FAILED: {res.error}", file=sys.stderr)
+        data = _asset(json.dumps(dash.payload()).encode("utf-8"), "application/json")
+
+        prev = self._snapshot
+        # keep serving the previous image for an output that failed this time,
+        # but not for one that has been removed from the config
+        kept = {k: v for k, v in prev.images.items() if k in {o.name for o in outputs}} if prev else {}
+        snap = Snapshot(
+            generation=(prev.generation + 1) if prev else 1,
+            dash=dash,
+            data=data,
+            images={**kept, **images},
+            expires=time.time() + cfg.refresh_minutes * 60,
+        )
+        with self._lock:
+            self._snapshot = snap
+            self._variants.clear()
+        print(f"refresh {snap.generation}: {len(images)}/{len(results)} outputs in {time.perf_counter() - t0:.2f}s")
+        return snap
+
+    def run_refresher(self) -> None:
+        """Refresh on the schedule, and early when the config file changes. Never returns."""
+        while True:
+            while time.time() < self.snapshot.expires:
+                time.sleep(min(self.poll_seconds, max(0.0, self.snapshot.expires - time.time())))
+                try:
+                    changed = self.watcher.poll()
+                except Exception as e:
+                    # e.g. a widget's invalidate_caches hook; the new config applies at the next refresh
+                    print(f"config poll failed: {type(e).__name__}: {e}", file=sys.stderr)
+                    continue
+                if changed:
+                    print(f"config reloaded: {', '.join(sorted(changed))} changed")
+                    break
+            try:
+                self.refresh()
+            except Exception as e:
+                # keep serving the last good snapshot; try again next period
+                print(f"refresh failed: {type(e).__name__}: {e}", file=sys.stderr)
+                prev = self.snapshot
+                with self._lock:
+                    self._snapshot = Snapshot(
+                        prev.generation, prev.dash, prev.data, prev.images,
+                        time.time() + self.watcher.cfg.refresh_minutes * 60,
+                    )
+
+    def primary_image(self) -> Asset | None:
+        snap = self.snapshot
+        for out in self.outputs:
+            if out.name in snap.images:
+                return snap.images[out.name]
+        return None
+
+    def variant(self, width: int, height: int, columns: int | None) -> Asset:
+        """The current data rendered at width x height, rendering it at most once."""
+        snap = self.snapshot
+        base = self.outputs[0]
+        cols = columns or base.columns
+        key = (snap.generation, width, height, cols)
+        with self._lock:
+            if key in self._variants:
+                return self._variants[key]
+            fut = self._pending.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._pending[key] = Future()
+        if not owner:
+            return fut.result()
+
+        try:
+            cfg = self.watcher.cfg
+            # one core per variant: the slots bound how many cores requests can take
+            pillow_cfg = {**cfg.pillow_renderer.as_dict(), "tiles": 1}
+            with self._render_slots, tempfile.TemporaryDirectory(prefix="wallboard-") as d:
+                path = render_with(
+                    base.renderer_kind, Path(d) / "variant.png", snap.dash, (width, height), cols,
+                    base.theme.as_dict(), cfg.web_renderer.as_dict(), pillow_cfg,
+                )
+                asset = _asset(path.read_bytes(), "image/png")
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            fut.set_exception(e)
+            raise
+        with self._lock:
+            del self._pending[key]
+            # variants from an older snapshot are dropped, not cached
+            if self._snapshot is not None and self._snapshot.generation == snap.generation:
+                while len(self._variants) >= MAX_VARIANTS:
+                    self._variants.pop(next(iter(self._variants)))
+                self._variants[key] = asset
+        fut.set_result(asset)
+        return asset
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _Server
+
+    def do_GET(self) -> None:
+        self._serve(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._serve(send_body=False)
+
+    def _serve(self, send_body: bool) -> None:
+        app = self.server.app
+        url = urlsplit(self.path)
+        try:
+            asset = self._route(app, url.path, parse_qs(url.query))
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+        except Exception as e:
+            self.send_error(500, f"{type(e).__name__}: {e}")
+            return
+        if asset is None:
+            self.send_error(404)
+            return
+
+        max_age = max(0, int(app.snapshot.expires - time.time()))
+        inm = self.headers.get("If-None-Match", "")
+        not_modified = asset.etag in (t.strip() for t in inm.split(",")) or inm.strip() == "*"
+        self.send_response(304 if not_modified else 200)
+        self.send_header("ETag", asset.etag)
+        self.send_header("Cache-Control", f"public, max-age={max_age}")
+        if not not_modified:
+            self.send_header("Content-Type", asset.content_type)
+            self.send_header("Content-Length", str(len(asset.body)))
+        self.end_headers()
+        if send_body and not not_modified:
+            self.wfile.write(asset.body)
+
+    def _route(self, app: Wallboard, path: str, query: dict[str, list[str]]) -> Asset | None:
+        if path == "/data.json":
+            return app.snapshot.data
+        if path in ("/", "/wallpaper.png"):
+            return app.primary_image()
+        m = _OUTPUT_PATH.match(path)
+        if m:
+            return app.snapshot.images.get(m.group(1))
+        m = _VARIANT_PATH.match(path)
+        if m:
+            w, h = int(m.group(1)), int(m.group(2))
+            if not (VARIANT_MIN_PX <= w <= VARIANT_MAX_PX and VARIANT_MIN_PX <= h <= VARIANT_MAX_PX):
+                raise ValueError(f"size must be between {VARIANT_MIN_PX} and {VARIANT_MAX_PX} px")
+            if w * h > VARIANT_MAX_PIXELS:
+                raise ValueError(f"at most {VARIANT_MAX_PIXELS} pixels (3840x2160)")
+            columns = int(query["columns"][0]) if "columns" in query else None
+            if columns is not None and not 1 <= columns <= 16:
+                raise ValueError("columns must be between 1 and 16")
+            return app.variant(w, h, columns)
+        return None
+
+    def log_message(self, format: str, *args) -> None:
+        # one line per request is too chatty for the journal; log errors only
+        pass
+
+    def log_error(self, format: str, *args) -> None:
+        sys.stderr.write(f"{self.address_string()} {format % args}\n")
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr: tuple[str, int], app: Wallboard) -> None:
+        super().__init__(addr, _Handler)
+        self.app = app
+
+def serve(
+    cfg: Config,
+    config_path: str | Path,
+    host: str,
+    port: int,
+    poll_seconds: float = 2.0,
+    renderer: str | None = None,
+    workers: int | None = None,
+) -> None:
+    """Run `wallboard serve` until interrupted.
+
+    GET /wallpaper.png         first configured output
+    GET /outputs/<name>.png    a configured output by name
+    GET /render/<W>x<H>.png    current data at another size (?columns=N)
+    GET /data.json             the DashboardData payload
+    """
+    app = Wallboard(cfg, config_path, poll_seconds, renderer, workers)
+    app.refresh()
+    threading.Thread(target=app.run_refresher, name="wallboard-refresh", daemon=True).start()
+    with _Server((host, port), app) as httpd:
+        print(f"serving on http://{host}:{httpd.server_address[1]}/")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
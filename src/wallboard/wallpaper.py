@@ -1,16 +1,148 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Protocol
+import filecmp
+import os
+import shutil
 import subprocess
 
-def set_gnome_wallpaper(image_path: Path) -> None:
-    uri = image_path.resolve().as_uri()
-    subprocess.run(
-        ["gsettings", "set", "org.gnome.desktop.background", "picture-uri", uri],
-        check=True
-    )
-    # Many GNOME versions also use picture-uri-dark
-    subprocess.run(
-        ["gsettings", "set", "org.gnome.desktop.background", "picture-uri-dark", uri],
-        check=False
+SCHEMA = "org.gnome.desktop.background"
+# Many GNOME versions also use picture-uri-dark
+KEYS = ("picture-uri", "picture-uri-dark")
+
+class WallpaperBackend(Protocol):
+    def get(self) -> tuple[str | None, str | None]:
+        """Current (picture-uri, picture-uri-dark); None where unknown."""
+        ...
+
+    def set(self, uri: str) -> None:
+        """Point both keys at uri."""
+        ...
+
+class GioBackend:
+    """Talks to dconf in-process through GSettings (PyGObject); no forks.
+
+    Raises ImportError or LookupError if PyGObject or the GNOME schema
+    isn't available.
+    """
+
+    def __init__(self) -> None:
+        import gi
+        gi.require_version("Gio", "2.0")
+        from gi.repository import Gio
+
+        source = Gio.SettingsSchemaSource.get_default()
+        if source is None or source.lookup(SCHEMA, True) is None:
+            raise LookupError(f"GSettings schema {SCHEMA} not installed")
+        self._gio = Gio
+        self._settings = Gio.Settings.new(SCHEMA)
+
+    def get(self) -> tuple[str | None, str | None]:
+        keys = self._settings.props.settings_schema.list_keys()
+        light, dark = (self._settings.get_string(k) if k in keys else None for k in KEYS)
+        return light, dark
+
+    def set(self, uri: str) -> None:
+        keys = self._settings.props.settings_schema.list_keys()
+        if all(self._settings.get_string(k) == uri for k in KEYS if k in keys):
+            return
+        # delay/apply writes both keys in one batch, so GNOME sees one change
+        self._settings.delay()
+        for k in KEYS:
+            if k in keys:
+                self._settings.set_string(k, uri)
+        self._settings.apply()
+        self._gio.Settings.sync()
+
+class GsettingsBackend:
+    """Fallback: runs the gsettings CLI. Doesn't read the current value,
+    since that would mean more forks."""
+
+    def get(self) -> tuple[str | None, str | None]:
+        return None, None
+
+    def set(self, uri: str) -> None:
+        subprocess.run(
+            ["gsettings", "set", SCHEMA, KEYS[0], uri],
+            check=True
+        )
+        subprocess.run(
+            ["gsettings", "set", SCHEMA, KEYS[1], uri],
+            check=False
+        )
+
+class MemoryBackend:
+    """Stand-in that keeps the keys in a dict, for headless use and tests."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+        self.writes = 0
+
+    def get(self) -> tuple[str | None, str | None]:
+        return self.values.get(KEYS[0]), self.values.get(KEYS[1])
+
+    def set(self, uri: str) -> None:
+        if all(self.values.get(k) == uri for k in KEYS):
+            return
+        self.values.update(dict.fromkeys(KEYS, uri))
+        self.writes += 1
+
+def make_backend(kind: str = "auto") -> WallpaperBackend:
+    """"gio", "gsettings", or "auto" (gio if available, else gsettings)."""
+    if kind == "gsettings":
+        return GsettingsBackend()
+    if kind == "gio":
+        return GioBackend()
+    if kind != "auto":
+        raise ValueError(f"Unknown wallpaper backend: {kind}")
+    try:
+        return GioBackend()
+    except (ImportError, ValueError, LookupError):
+        return GsettingsBackend()
+
+def _slots(image_path: Path) -> tuple[Path, Path]:
+    return (
+        image_path.with_name(f"{image_path.stem}.a{image_path.suffix}"),
+        image_path.with_name(f"{image_path.stem}.b{image_path.suffix}"),
     )
+
+def _publish(src: Path, dst: Path) -> None:
+    # A copy, not a hard link: the slot GNOME shows must not change if src
+    # is later rewritten in place.
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+def set_gnome_wallpaper(image_path: Path, backend: WallpaperBackend | None = None) -> Path:
+    """Show image_path as the GNOME background. Returns the path GNOME was given.
+
+    GNOME may not reload a URI it is already showing, so the image is
+    published alternately as <stem>.a.png and <stem>.b.png and the keys are
+    pointed at whichever one isn't current. If the current one already has
+    identical contents and the backend reports it is set, nothing is
+    written at all.
+    """
+    backend = backend or make_backend()
+    image_path = image_path.resolve()
+    slots = _slots(image_path)
+
+    light, dark = backend.get()
+    if light is not None:
+        current = next((s for s in slots if s.as_uri() == light and s.exists()), None)
+    else:
+        # backend can't tell us; the most recently published slot is current
+        current = max((s for s in slots if s.exists()), key=lambda s: s.stat().st_mtime_ns, default=None)
+
+    if current is not None and filecmp.cmp(current, image_path, shallow=False):
+        # Unknown keys may point anywhere (a failed set, the user's own
+        # background), so they are set anyway; same URI, so no reload.
+        if light is not None and dark in (None, light):
+            return current
+        backend.set(current.as_uri())
+        return current
+
+    target = slots[1] if current == slots[0] else slots[0]
+    _publish(image_path, target)
+    backend.set(target.as_uri())
+    return target
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+from .config import Config, _expand, changed_sections, load_config
+from . import renderers, widgets
+
+def _signature(path: Path) -> tuple[int, int, int] | None:
+    # inode catches editors that save by writing a new file and renaming it
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+def invalidate_caches(changed: set[str]) -> None:
+    """Tell every loaded widget and renderer which config sections changed."""
+    widgets.invalidate_caches(changed)
+    renderers.invalidate_caches(changed)
+
+class ConfigWatcher:
+    """Reloads a config file when it changes on disk (stat polling).
+
+    Call poll() periodically. A file that fails to load or validate is
+    reported and ignored; the previous config stays in effect.
+    """
+
+    def __init__(self, path: str | Path, cfg: Config) -> None:
+        self.path = Path(_expand(str(path)))
+        self.cfg = cfg
+        self._sig = _signature(self.path)
+
+    def poll(self) -> set[str]:
+        """Reload if the file changed. Returns the changed config sections."""
+        sig = _signature(self.path)
+        if sig is None or sig == self._sig:
+            return set()
+        self._sig = sig
+        try:
+            new = load_config(self.path)
+        except Exception as e:
+            # a bad edit must never take down a long-running process
+            print(f"config reload failed, keeping previous config: {type(e).__name__}: {e}", file=sys.stderr)
+            return set()
+        changed = changed_sections(self.cfg, new)
+        self.cfg = new
+        if changed:
+            invalidate_caches(changed)
+        return changed
@@ -1,10 +1,90 @@
 from __future__ import annotations
 
-from . import clock, system, weather, calendar
+from collections.abc import Iterator, Mapping
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-REGISTRY = {
-    clock.name: clock,
-    system.name: system,
-    weather.name: weather,
-    calendar.name: calendar,
+from .base import Widget
+
+if TYPE_CHECKING:
+    from importlib.metadata import EntryPoint
+
+# Third-party packages can add widgets by declaring an entry point in this
+# group, e.g. in their pyproject.toml:
+#
+#   [project.entry-points."wallboard.widgets"]
+#   mywidget = "mypackage.mywidget"
+#
+# The target must provide `name`, `title` and `collect(cfg)` (see base.Widget).
+ENTRY_POINT_GROUP = "wallboard.widgets"
+
+# Built-in widgets, by name -> submodule. Imported only when first requested,
+# so e.g. caldav/icalendar are never loaded unless `calendar` is configured.
+_BUILTIN = {
+    "clock": "clock",
+    "system": "system",
+    "weather": "weather",
+    "calendar": "calendar",
 }
+
+class _Registry(Mapping[str, Widget]):
+    """Name -> widget mapping that imports each widget on first lookup."""
+
+    def __init__(self) -> None:
+        self._loaded: dict[str, Widget] = {}
+        self._plugins: dict[str, EntryPoint] | None = None
+
+    def _entry_points(self) -> dict[str, EntryPoint]:
+        # Scanning installed distributions isn't free; only do it once, and
+        # only when a name isn't one of the built-ins.
+        if self._plugins is None:
+            # importlib.metadata itself costs tens of ms; not needed for built-ins
+            from importlib.metadata import entry_points
+
+            self._plugins = {ep.name: ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
+        return self._plugins
+
+    def __getitem__(self, name: str) -> Widget:
+        mod = self._loaded.get(name)
+        if mod is not None:
+            return mod
+        if name in _BUILTIN:
+            mod = import_module(f".{_BUILTIN[name]}", __name__)
+        else:
+            ep = self._entry_points().get(name)
+            if ep is None:
+                raise KeyError(name)
+            mod = ep.load()
+        self._loaded[name] = mod
+        return mod
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._loaded or name in _BUILTIN or name in self._entry_points()
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _BUILTIN
+        yield from (n for n in self._entry_points() if n not in _BUILTIN)
+        yield from (n for n in self._loaded if n not in _BUILTIN and n not in self._entry_points())
+
+    def register(self, name: str, widget: Widget) -> None:
+        """Add (or replace) a widget in-process, e.g. from a test or harness."""
+        self._loaded[name] = widget
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def loaded(self) -> list[Widget]:
+        """Widgets imported so far."""
+        return list(self._loaded.values())
+
+REGISTRY = _Registry()
+
+def invalidate_caches(changed: set[str]) -> None:
+    """Pass changed config section names to each loaded widget that caches.
+
+    Widgets opt in by defining `invalidate_caches(changed)`.
+    """
+    for mod in REGISTRY.loaded():
+        hook = getattr(mod, "invalidate_caches", None)
+        if hook is not None:
+            hook(changed)
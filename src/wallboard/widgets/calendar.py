@@ -6,8 +6,8 @@ import os
 
 from dateutil import parser as dtparser
 from icalendar import Calendar
-import caldav
 
+from ..config import CALENDAR_DEFAULTS
 from .base import WidgetResult
 
 name = "calendar"
@@ -58,6 +58,9 @@ def _load_from_ics(path: str) -> list[dict]:
     return _parse_ics_events(p.read_text(encoding="utf-8"))
 
 def _load_from_caldav(url: str, username: str, password: str) -> list[dict]:
+    # caldav is slow to import; only pay for it when source is "caldav"
+    import caldav
+
     client = caldav.DAVClient(url=url, username=username, password=password)
     principal = client.principal()
     calendars = principal.calendars()
@@ -76,20 +79,20 @@ def _load_from_caldav(url: str, username: str, password: str) -> list[dict]:
 
 def collect(cfg: dict) -> WidgetResult:
     try:
-        ccfg = cfg.get("calendar", {})
-        source = str(ccfg.get("source", "ics")).lower()
-        horizon_hours = int(ccfg.get("horizon_hours", 12))
-        max_events = int(ccfg.get("max_events", 5))
+        ccfg = {**CALENDAR_DEFAULTS, **(cfg.get("calendar") or {})}
+        source = str(ccfg["source"]).lower()
+        horizon_hours = int(ccfg["horizon_hours"])
+        max_events = int(ccfg["max_events"])
 
         now = datetime.now().astimezone()
         horizon = now + timedelta(hours=horizon_hours)
 
         if source == "ics":
-            events = _load_from_ics(str(ccfg.get("ics_path", "")))
+            events = _load_from_ics(str(ccfg["ics_path"]))
         elif source == "caldav":
-            url = str(ccfg.get("caldav_url", "")).strip()
-            user = str(ccfg.get("caldav_username", "")).strip()
-            pw = str(ccfg.get("caldav_password", "")).strip()
+            url = str(ccfg["caldav_url"]).strip()
+            user = str(ccfg["caldav_username"]).strip()
+            pw = str(ccfg["caldav_password"]).strip()
             if not (url and user and pw):
                 return WidgetResult(name=name, title=title, data={}, ok=False, error="CalDAV configured but missing url/username/password")
             events = _load_from_caldav(url, user, pw)
@@ -8,11 +8,21 @@ from pathlib import Path
 import requests
 from platformdirs import user_cache_dir
 
+from ..config import WEATHER_DEFAULTS
 from .base import WidgetResult
 
 name = "weather"
 title = "Weather"
 
+# In-process copies of the disk caches, for long-running processes
+_geo_memo: dict[str, tuple[float, float, str]] = {}
+_forecast_memo: dict[str, dict] = {}
+
+def invalidate_caches(changed: set[str]) -> None:
+    if "weather" in changed:
+        _geo_memo.clear()
+        _forecast_memo.clear()
+
 
 # Cache utilities
 def _get_cache_dir() -> Path:
@@ -44,12 +54,15 @@ def _params_hash(url: str, params: dict) -> str:
 
 def _zip_to_latlon(zip_code: str) -> tuple[float, float, str]:
     # US-only, no key. If you want international later, swap this out.
+    if zip_code in _geo_memo:
+        return _geo_memo[zip_code]
     cache_dir = _get_cache_dir()
     cache_path = cache_dir / f"zip_{zip_code}.json"
     cached = _cache_load_json(cache_path)
     if cached:
         try:
-            return float(cached["lat"]), float(cached["lon"]), str(cached["label"])
+            _geo_memo[zip_code] = float(cached["lat"]), float(cached["lon"]), str(cached["label"])
+            return _geo_memo[zip_code]
         except Exception:
             pass
 
@@ -63,16 +76,17 @@ def _zip_to_latlon(zip_code: str) -> tuple[float, float, str]:
 
     # save cache (no expiration)
     _cache_save_json(cache_path, {"lat": lat, "lon": lon, "label": label})
+    _geo_memo[zip_code] = lat, lon, label
     return lat, lon, label
 
 def collect(cfg: dict) -> WidgetResult:
     try:
-        wcfg = cfg.get("weather", {})
-        zip_code = str(wcfg.get("zip_code", "")).strip()
+        wcfg = {**WEATHER_DEFAULTS, **(cfg.get("weather") or {})}
+        zip_code = str(wcfg["zip_code"]).strip()
         if not zip_code:
             return WidgetResult(name=name, title=title, data={}, ok=False, error="weather.zip_code not set")
 
-        units = str(wcfg.get("units", "imperial")).lower()
+        units = str(wcfg["units"]).lower()
         lat, lon, label = _zip_to_latlon(zip_code)
 
         # Open-Meteo: current + hourly
@@ -89,19 +103,21 @@ def collect(cfg: dict) -> WidgetResult:
 
         # caching: compute key from URL+params and honor configurable expiration
         cache_dir = _get_cache_dir()
-        expire_seconds = int(wcfg.get("cache_expire_seconds", 3600))
+        expire_seconds = int(wcfg["cache_expire_seconds"])
         url = "https://api.open-meteo.com/v1/forecast"
         key = _params_hash(url, params)
         cache_path = cache_dir / f"om_{key}.json"
-        cached = _cache_load_json(cache_path)
+        cached = _forecast_memo.get(key) or _cache_load_json(cache_path)
         if cached and isinstance(cached, dict) and (time.time() - float(cached.get("ts", 0)) < expire_seconds):
             js = cached.get("resp", {})
+            _forecast_memo[key] = cached
         else:
             r = requests.get(url, params=params, timeout=10)
             r.raise_for_status()
             js = r.json()
+            _forecast_memo[key] = {"ts": time.time(), "resp": js}
             try:
-                _cache_save_json(cache_path, {"ts": time.time(), "resp": js})
+                _cache_save_json(cache_path, _forecast_memo[key])
             except Exception:
                 pass
 